@@ -1,18 +1,51 @@
 #!/usr/bin/python3
 
-import os
 import sys
 import argparse
 import re
 import logging
+import functools
+import importlib
 import gi
 gi.require_version('GIRepository', '2.0')
 gi.require_version('GObject', '2.0')
+try:
+    gi.require_version('Gtk', '4.0')
+    _GTK4_AVAILABLE = True
+except ValueError:
+    # Without the Gtk 4 typelib, get_parent_hierarchy falls back to the parent class name
+    _GTK4_AVAILABLE = False
 from gi.repository import GIRepository, GObject
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 
+logger = logging.getLogger(__name__)
+
+_REPOSITORY = GIRepository.Repository.get_default()
+
+# Namespaces that must be resolved against Gtk 4; unpinned, they could load Gtk 3
+_GTK4_NAMESPACES = frozenset({'Gtk', 'Gdk', 'Gsk', 'Adw'})
+
+# Map Rust crate names to gi.repository module names
+_MODULE_MAP = {
+    'gtk': 'Gtk',
+    'glib': 'GLib',
+    'gio': 'Gio',
+    'gdk': 'Gdk',
+    'gdk4': 'Gdk',
+    'gsk': 'Gsk',
+    'pango': 'Pango',
+    'cairo': 'cairo',
+    'adw': 'Adw',
+}
+
+@functools.lru_cache(maxsize=None)
+def _import_gi_module(module_name: str):
+    """Import a gi.repository module once and reuse it afterwards."""
+    return importlib.import_module(f"gi.repository.{module_name}")
+
 @dataclass
 class Property:
     name: str
@@ -26,10 +59,22 @@ class Signal:
     name: str
     params: List[Tuple[str, str]]  # List of (param_name, param_type)
     return_type: Optional[str] = None
+    rust_name: str = field(init=False, repr=False)  # name with hyphens converted for Rust methods
+
+    def __post_init__(self):
+        self.rust_name = self.name.replace('-', '_')
 
 class RustGObjectGenerator:
     VALID_IDENTIFIER = re.compile(r'^[A-Za-z][A-Za-z0-9_-]*$')
     VALID_CLASSNAME = re.compile(r'^[A-Z][A-Za-z0-9]*$')
+    # name:type, matched after the #doc and trailing ? are split off and the rest is stripped
+    PROPERTY_PATTERN = re.compile(r'(?P<name>[A-Za-z][A-Za-z0-9_-]*)\s*:\s*(?P<type>[^\s?][^?]*)')
+    # name[(params)] [-> return_type], matched against the stripped signal string
+    SIGNAL_PATTERN = re.compile(
+        r'(?P<name>[A-Za-z][A-Za-z0-9_-]*)(?:\s*\((?P<params>[^)]*)\))?(?:\s*->\s*(?P<ret>.*))?'
+    )
+    # One stripped entry of a signal parameter list: name:type
+    PARAM_PATTERN = re.compile(r'(?P<name>[A-Za-z][A-Za-z0-9_-]*)\s*:\s*(?P<type>\S.*)')
     
     TYPE_MAPPING = {
         'string': 'String',
@@ -45,8 +90,7 @@ class RustGObjectGenerator:
         'object': 'glib::Object',
     }
 
-    def __init__(self):
-        self.imp_template = '''// Generated by RustGObjectGenerator
+    IMP_TEMPLATE = '''// Generated by RustGObjectGenerator
 // This file is licensed under the same terms as the project it belongs to
 
 use gtk::{{glib, prelude::*, subclass::prelude::*}};
@@ -152,30 +196,42 @@ impl {class_name} {{
         """Parse property string into Property object with validation."""
         try:
             # Handle optional documentation
-            if '#' in prop_str:
-                prop_str, doc = prop_str.split('#', 1)
-                doc = doc.strip()
-            else:
-                doc = None
+            prop, has_doc, doc = prop_str.partition('#')
+            doc = doc.strip() if has_doc else None
 
-            # Split name and type
-            if ':' not in prop_str:
-                raise ValueError("Property must be in format 'name:type'")
-                
-            name, type_str = prop_str.split(':', 1)
-            name = name.strip()
-            type_str = type_str.strip()
-            
-            if not self.validate_identifier(name):
-                raise ValueError(f"Invalid property name: {name}")
-            
             # Handle nullable types
-            nullable = type_str.endswith('?')
+            prop = prop.strip()
+            nullable = prop.endswith('?')
             if nullable:
-                type_str = type_str[:-1]
+                prop = prop[:-1].rstrip()
+
+            match = self.PROPERTY_PATTERN.fullmatch(prop)
+            if not match:
+                # Only reached for invalid input, so work out which part is wrong
+                if ':' not in prop:
+                    raise ValueError("Property must be in format 'name:type'")
+                name, _, type_str = prop.partition(':')
+                name = name.strip()
+                type_str = type_str.strip()
+                if not self.validate_identifier(name):
+                    raise ValueError(f"Invalid property name: {name}")
+                if not type_str:
+                    raise ValueError(f"Missing type for property: {name}")
+                if nullable:
+                    type_str += '?'
+                # The type is not blank, so the pattern can only have rejected a misplaced '?'
+                trailing = type_str.partition('?')[2].strip()
+                if trailing and '?' not in trailing:
+                    raise ValueError(f"Unexpected text after '?' in type of property {name}: '{trailing}'")
+                raise ValueError(f"'?' may only appear once, at the end of the type of property {name}, got '{type_str}'")
+
+            name = match.group('name')
+            type_str = match.group('type')
+            
+            rust_type = self.TYPE_MAPPING.get(type_str.lower())
             
             # Handle custom types
-            if type_str.lower() not in self.TYPE_MAPPING:
+            if rust_type is None:
                 # Assume it's a custom type
                 return Property(
                     name=name,
@@ -186,9 +242,6 @@ impl {class_name} {{
                 )
             
             # Handle built-in types
-            type_str = type_str.lower()
-            rust_type = self.TYPE_MAPPING[type_str]
-            
             if nullable:
                 rust_type = f'Option<{rust_type}>'
             
@@ -206,167 +259,135 @@ impl {class_name} {{
     def parse_signal(self, signal_str: str) -> Signal:
         """Parse signal string into Signal object with validation."""
         try:
-            # Handle return type if present
-            if '->' in signal_str:
-                signal_str, return_type = signal_str.split('->', 1)
-                return_type = return_type.strip()
-            else:
-                return_type = None
-
-            # Handle parameters if present
-            if '(' in signal_str:
-                name, params_str = signal_str.split('(', 1)
-                params_str = params_str.rstrip(')')
-                name = name.strip()
-                params = []
-                
-                if params_str:
-                    for param in params_str.split(','):
-                        param = param.strip()
-                        if not param:
-                            continue
-                        if ':' in param:
-                            param_name, param_type = param.split(':', 1)
-                            param_name = param_name.strip()
-                            param_type = param_type.strip()
-                            if not self.validate_identifier(param_name):
-                                raise ValueError(f"Invalid parameter name: {param_name}")
-                            params.append((param_name, param_type))
-                        else:
-                            raise ValueError(f"Invalid parameter format: {param}")
-            else:
-                name = signal_str.strip()
-                params = []
-
-            # Validate the Rust method name (after converting hyphens)
-            rust_method_name = name.replace('-', '_')
-            if not self.validate_identifier(rust_method_name):
-                raise ValueError(f"Invalid signal name (after converting hyphens): {name}")
-                
-            return Signal(name=name, params=params, return_type=return_type)
+            # The name pattern also guarantees a valid Rust method name once hyphens are converted
+            match = self.SIGNAL_PATTERN.fullmatch(signal_str.strip())
+            if not match:
+                # Only reached for invalid input, so work out which part is wrong
+                name = signal_str.split('->', 1)[0].split('(', 1)[0].strip()
+                if not self.validate_identifier(name):
+                    raise ValueError(f"Invalid signal name: {name}")
+                raise ValueError(f"Malformed parameter list or return type for signal: {name}")
+
+            params = []
+            for entry in (match.group('params') or '').split(','):
+                entry = entry.strip()
+                if not entry:
+                    continue
+                param = self.PARAM_PATTERN.fullmatch(entry)
+                if not param:
+                    param_name = entry.split(':', 1)[0].strip()
+                    if ':' in entry and not self.validate_identifier(param_name):
+                        raise ValueError(f"Invalid parameter name: {param_name}")
+                    raise ValueError(f"Invalid parameter format: {entry}")
+                params.append((param.group('name'), param.group('type')))
+
+            return Signal(name=match.group('name'), params=params, return_type=match.group('ret') or None)
                 
         except ValueError as e:
             raise ValueError(f"Invalid signal format. Expected 'name(param:type,...) -> return_type' or 'name', got '{signal_str}'. {str(e)}")
 
+    def _format_prop(self, prop: Property) -> str:
+        """Format a single property field, including its doc comment."""
+        # Add documentation if present
+        doc = f'        /// {prop.doc}\n' if prop.doc else ''
+        
+        # Only the property attribute depends on nullability; rust_type is used as parsed
+        attributes = 'get, set, nullable' if prop.nullable else 'get, set'
+        return f'{doc}        #[property({attributes})]\n        {prop.name}: RefCell<{prop.rust_type}>,'
+
     def generate_properties_code(self, properties: List[Property]) -> str:
         """Generate Rust code for properties."""
-        prop_lines = []
-        for prop in properties:
-            # Add documentation if present
-            if prop.doc:
-                prop_lines.append(f'        /// {prop.doc}')
-            
-            # Handle different property types
-            if prop.nullable:
-                # For nullable types, we wrap in Option<T> once
-                prop_lines.append(f'        #[property(get, set, nullable)]\n        {prop.name}: RefCell<{prop.rust_type}>,')
-            elif 'Object' in prop.rust_type and prop.nullable:
-                # For nullable object types, we wrap in Option<T>
-                prop_lines.append(f'        #[property(get, set)]\n        {prop.name}: RefCell<Option<{prop.rust_type}>>,')
-            elif 'Object' in prop.rust_type:
-                # For non-nullable object types
-                prop_lines.append(f'        #[property(get, set)]\n        {prop.name}: RefCell<{prop.rust_type}>,')
-            else:
-                # For non-nullable types
-                prop_lines.append(f'        #[property(get, set)]\n        {prop.name}: RefCell<{prop.rust_type}>,')
+        return '\n'.join(self._format_prop(prop) for prop in properties) or '        // No properties defined'
+
+    def _format_signal(self, signal: Signal) -> str:
+        """Format a single Signal::builder expression."""
+        builder = f'Signal::builder("{signal.name}")'
+        
+        if signal.params:
+            # Generate static_type() calls for each parameter type
+            params_str = ', '.join(
+                f'{type_}::static_type()'
+                for _, type_ in signal.params
+            )
+            builder += f'\n                    .param_types([{params_str}])'
         
-        return '\n'.join(prop_lines) if prop_lines else '        // No properties defined'
+        if signal.return_type:
+            builder += f'\n                    .return_type::<{signal.return_type}>()'
+        
+        return builder + '\n                    .build(),'
 
     def generate_signals_code(self, signals: List[Signal]) -> str:
         """Generate Rust code for signals."""
-        signal_lines = []
-        for signal in signals:
-            builder = f'Signal::builder("{signal.name}")'
-            
-            if signal.params:
-                # Generate static_type() calls for each parameter type
-                params_str = ', '.join(
-                    f'{type_}::static_type()'
-                    for _, type_ in signal.params
-                )
-                builder += f'\n                    .param_types([{params_str}])'
-            
-            if signal.return_type:
-                builder += f'\n                    .return_type::<{signal.return_type}>()'
-            
-            builder += '\n                    .build(),'
-            signal_lines.append(builder)
+        return '\n'.join(self._format_signal(signal) for signal in signals) or '                // No signals defined'
+
+    def _format_template_child(self, child: str) -> str:
+        """Format a single template child field from a 'name:type' string."""
+        # Split on first colon only to handle Rust-style types
+        if ':' not in child:
+            raise ValueError(f"Template child must be in format 'name:type', got '{child}'")
             
-        return '\n'.join(signal_lines) if signal_lines else '                // No signals defined'
+        first_colon = child.find(':')
+        name = child[:first_colon].strip()
+        type_ = child[first_colon+1:].strip()
+        
+        # Validate the name
+        if not self.validate_identifier(name):
+            raise ValueError(f"Invalid template child name: {name}")
+        return f'        #[template_child]\n        pub {name}: TemplateChild<{type_}>,'
 
     def generate_template_children(self, children: List[str]) -> str:
         """Generate template children code."""
         if not children:
             return "        // No template children defined"
             
-        lines = []
-        for child in children:
-            # Split on first colon only to handle Rust-style types
-            if ':' not in child:
-                raise ValueError(f"Template child must be in format 'name:type', got '{child}'")
-                
-            first_colon = child.find(':')
-            name = child[:first_colon].strip()
-            type_ = child[first_colon+1:].strip()
-            
-            # Validate the name
-            if not self.validate_identifier(name):
-                raise ValueError(f"Invalid template child name: {name}")
-            lines.append(f'        #[template_child]\n        pub {name}: TemplateChild<{type_}>,')
+        return '\n'.join(self._format_template_child(child) for child in children)
 
-        return '\n'.join(lines)
+    def _format_template_callback(self, callback: str) -> str:
+        """Format a single template callback method from a signal-like string."""
+        try:
+            # Parse using the same logic as signals
+            signal = self.parse_signal(callback)
+        except ValueError:
+            # Fall back to simple callback if parsing fails
+            return f'        #[template_callback]\n        {callback}'
+            
+        # Build parameter string
+        params_str = ', '.join(f'{name}: {type_}' for name, type_ in signal.params)
+        
+        # Build return type
+        return_type = f' -> {signal.return_type}' if signal.return_type else ''
+        
+        # Build method body
+        method_body = f'fn {signal.name}(&self, {params_str}){return_type} {{\n'
+        method_body += '        // TODO: Implement callback\n'
+        method_body += '    }'
+        
+        return f'        #[template_callback]\n        {method_body}'
 
     def generate_template_callbacks(self, callbacks: List[str]) -> str:
         """Generate template callback methods with signal-like syntax."""
         if not callbacks:
             return "        // No template callbacks defined"
             
-        lines = []
-        for callback in callbacks:
-            try:
-                # Parse using the same logic as signals
-                signal = self.parse_signal(callback)
-                
-                # Build parameter string
-                params_str = ', '.join(f'{name}: {type_}' for name, type_ in signal.params)
-                
-                # Build return type
-                return_type = f' -> {signal.return_type}' if signal.return_type else ''
-                
-                # Build method body
-                method_body = f'fn {signal.name}(&self, {params_str}){return_type} {{\n'
-                method_body += '        // TODO: Implement callback\n'
-                method_body += '    }'
-                
-                lines.append(f'        #[template_callback]\n        {method_body}')
-                
-            except ValueError as e:
-                # Fall back to simple callback if parsing fails
-                lines.append(f'        #[template_callback]\n        {callback}')
-            
-        return '\n'.join(lines)
+        return '\n'.join(self._format_template_callback(callback) for callback in callbacks)
 
     def generate_additional_methods(self, properties: List[Property], signals: List[Signal]) -> str:
         """Generate additional helper methods."""
-        methods = []
+        emit_methods = []
+        connect_methods = []
         
-        # Generate signal emission methods
         for signal in signals:
             params_str = ', '.join(f'{name}: {type_}' for name, type_ in signal.params)
-            # Convert hyphens to underscores in method name
-            rust_method_name = signal.name.replace('-', '_')
-            method_name = f"emit_{rust_method_name}"
-            if params_str:
-                methods.append(f'''    pub fn {method_name}(&self, {params_str}) {{
-        self.emit_by_name::<()>("{signal.name}", &[{', '.join(f'&{n}' for n, _ in signal.params)}]);
-    }}''')
-            else:
-                methods.append(f'''    pub fn {method_name}(&self) {{
-        self.emit_by_name::<()>("{signal.name}", &[]);
+            arg_names = ', '.join(name for name, _ in signal.params)
+
+            # Generate signal emission method
+            emit_params = f'&self, {params_str}' if params_str else '&self'
+            emit_refs = ', '.join(f'&{name}' for name, _ in signal.params)
+            emit_methods.append(f'''    pub fn emit_{signal.rust_name}({emit_params}) {{
+        self.emit_by_name::<()>("{signal.name}", &[{emit_refs}]);
     }}''')
 
-        # Generate signal connection methods
-        for signal in signals:
+            # Generate signal connection method
             # Build closure parameter types (without names)
             param_types = [type_ for _, type_ in signal.params]
             
@@ -376,7 +397,7 @@ impl {class_name} {{
             # Build closure type
             closure_type = f'Fn({", ".join(param_types)}) -> {return_type} + \'static'
             
-            # Build method signature
+            # Extract the closure arguments from the signal values
             param_lines = []
             if signal.params:
                 param_lines.append('let obj = values[0].get::<Self>().expect("Failed to get self from values");')
@@ -384,18 +405,25 @@ impl {class_name} {{
                     f'let {name} = values[{i+1}].get::<{type_}>().expect("Failed to get parameter {name}");'
                     for i, (name, type_) in enumerate(signal.params)
                 )
-            
-            # Convert hyphens to underscores in method name
-            rust_method_name = signal.name.replace('-', '_')
-            methods.append(f'''    pub fn connect_{rust_method_name}<F: {closure_type}>(&self, f: F) -> glib::SignalHandlerId {{
+            # Every extracted line is followed by a newline and the closure body indent
+            param_block = '\n            '.join(param_lines + [''])
+
+            if return_type != '()':
+                call = f'let result = f({arg_names});'
+                result = 'Some(result.to_value())'
+            else:
+                call = f'f({arg_names});'
+                result = 'None'
+
+            connect_methods.append(f'''    pub fn connect_{signal.rust_name}<F: {closure_type}>(&self, f: F) -> glib::SignalHandlerId {{
         self.connect_local("{signal.name}", false, move |values| {{
-            {''.join(f'{line}\n            ' for line in param_lines)}
-            {f'let result = f({", ".join(name for name, _ in signal.params)});' if return_type != '()' else f'f({", ".join(name for name, _ in signal.params)});'}
-            {f'Some(result.to_value())' if return_type != '()' else 'None'}
+            {param_block}
+            {call}
+            {result}
         }})
     }}''')
 
-        return '\n\n'.join(methods)
+        return '\n\n'.join(emit_methods + connect_methods)
 
     def print_widget_hierarchy(self, widget, indent=0):
         """
@@ -403,25 +431,21 @@ impl {class_name} {{
         
         Args:
             widget: A GTK widget or GType
-            indent: Current indentation level (used recursively)
+            indent: Indentation level of the first (most derived) class
         """
         if isinstance(widget, GObject.GType):
             current_type = widget
         else:
             current_type = widget.get_type()
         
-        # Get the name of the current class
-        type_name = current_type.name
-        
-        # Print the current class with proper indentation
-        print("  " * indent + f"└─ {type_name}")
-        
-        # Get parent type
-        parent_type = current_type.parent
-        
-        # Recursively print parent classes until we reach GObject
-        if parent_type and parent_type.name != "GObject":
-            self.print_widget_hierarchy(parent_type, indent + 1)
+        # Print each class with increasing indentation, walking parents until we reach GObject
+        while True:
+            print("  " * indent + f"└─ {current_type.name}")
+            
+            current_type = current_type.parent
+            if not current_type or current_type.name == "GObject":
+                break
+            indent += 1
 
     def get_widget_hierarchy_list(self, info):
         """
@@ -446,95 +470,62 @@ impl {class_name} {{
             
             # Get parent info
             try:
-                parent_type = current_info.get_parent()
-                if not parent_type:
-                    break
-                    
-                current_info = GIRepository.Repository.get_default().find_by_name(
-                    parent_type.get_namespace(),
-                    parent_type.get_name()
-                )
+                current_info = GIRepository.object_info_get_parent(current_info)
             except Exception as e:
-                logging.debug(f"Error getting parent info: {str(e)}")
+                logger.debug("Error getting parent info: %s", e)
                 break
                 
         return hierarchy
 
-    def get_parent_hierarchy(self, parent_class: str) -> List[str]:
-        """Get the full parent hierarchy using the simpler hierarchy function."""
-        logger = logging.getLogger(__name__)
-        
-        def hierarchy(cls, parents = []):
-            """Recursively get all parent classes until InitiallyUnowned."""
-            if cls == GObject.GInterface:
-                return False
-            if cls == GObject.InitiallyUnowned:
-                return True
-            parents.append(cls)
-            for b in cls.__bases__:
-                if hierarchy(b, parents):
-                    return True
-            parents.pop()
-            return False
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def get_parent_hierarchy(parent_class: str) -> Tuple[str, ...]:
+        """Get the parent hierarchy, up to InitiallyUnowned, from the GI repository.
 
+        Results are cached per parent class, since resolving them imports and
+        walks the GI module.
+        """
         try:
-            # Require GTK 4.0 before importing
-            gi.require_version('Gtk', '4.0')
-            from gi.repository import GObject
-            
-            # Convert Rust-style type names to Python module paths
+            # Convert Rust-style type names to GI namespaces
             if '::' in parent_class:
-                module, classname = parent_class.split('::', 1)
-                # Map Rust module names to Python modules
-                module_map = {
-                    'gtk': 'Gtk',
-                    'glib': 'GLib',
-                    'gio': 'Gio',
-                    'gdk': 'Gdk',
-                    'gdk4': 'Gdk',
-                    'gsk': 'Gsk',
-                    'pango': 'Pango',
-                    'cairo': 'cairo',
-                    'adw': 'Adw',
-                }
-                module = module_map.get(module.lower(), module)
-                import_path = f"gi.repository.{module}"
+                namespace, classname = parent_class.split('::', 1)
+                namespace = _MODULE_MAP.get(namespace.lower(), namespace)
             else:
                 # Try common GTK modules
-                import_path = f"gi.repository.{parent_class.split('.')[0]}"
+                namespace = parent_class.split('.')[0]
                 classname = parent_class.split('.')[-1]
 
-            # Import the module and get the class
-            module = __import__(import_path, fromlist=[classname])
-            widget_class = getattr(module, classname)
-            
-            # Get the hierarchy using the new function
-            parents = []
-            hierarchy(widget_class, parents)
+            if namespace in _GTK4_NAMESPACES and not _GTK4_AVAILABLE:
+                raise ValueError(f"Gtk 4.0 is not available to resolve {namespace}.{classname}")
+
+            # Importing the module loads its typelib into the repository
+            _import_gi_module(namespace)
+            info = _REPOSITORY.find_by_name(namespace, classname)
+            if not info:
+                raise ValueError(f"{namespace}.{classname} not found in the GI repository")
             
-            # Convert to Rust-style module::Class format and remove duplicates
+            # Walk the parent infos until InitiallyUnowned, converting to Rust-style module::Class format
             rust_hierarchy = []
-            seen = set()
-            for cls in parents:
-                module_name = cls.__module__.split('.')[-1].lower()
-                if module_name == 'gtk':
-                    rust_class = f"gtk::{cls.__name__}"
-                elif module_name == 'gobject':
-                    rust_class = f"glib::{cls.__name__}"
-                else:
-                    rust_class = f"{module_name}::{cls.__name__}"
+            while info:
+                info_namespace = info.get_namespace()
+                name = info.get_name()
+                if info_namespace == 'GObject' and name == 'InitiallyUnowned':
+                    break
                 
-                if rust_class not in seen:
-                    rust_hierarchy.append(rust_class)
-                    seen.add(rust_class)
+                module_name = 'glib' if info_namespace == 'GObject' else info_namespace.lower()
+                rust_hierarchy.append(f"{module_name}::{name}")
+                info = GIRepository.object_info_get_parent(info)
+            else:
+                # Not a widget: the chain ended without reaching InitiallyUnowned
+                rust_hierarchy = []
             
-            logger.debug(f"Generated hierarchy for {parent_class}: {rust_hierarchy}")
-            return rust_hierarchy
+            logger.debug("Generated hierarchy for %s: %s", parent_class, rust_hierarchy)
+            return tuple(rust_hierarchy)
             
         except Exception as e:
-            logger.error(f"Error getting hierarchy for {parent_class}: {str(e)}")
+            logger.error("Error getting hierarchy for %s: %s", parent_class, e)
             logger.debug("Full exception:", exc_info=True)
-            return [parent_class]
+            return (parent_class,)
 
     def generate_code(self, class_name: str, parent_class: str, 
                      properties: List[str], signals: List[str], 
@@ -544,9 +535,6 @@ impl {class_name} {{
                      additional_imports: Optional[List[str]] = None) -> str:
         """Generate complete Rust code for the GObject class."""
         try:
-            logging.basicConfig(level=logging.DEBUG)
-            logger = logging.getLogger(__name__)
-            
             if not self.validate_class_name(class_name):
                 raise ValueError(f"Invalid class name: {class_name}")
 
@@ -555,82 +543,71 @@ impl {class_name} {{
             parsed_signals = [self.parse_signal(signal) for signal in signals]
 
             # Handle template file path
-            logger.debug(f"Original template_file: {template_file}")
+            logger.debug("Original template_file: %s", template_file)
             template_path = template_file.replace('\\', '\\\\') if template_file else ""
-            logger.debug(f"Processed template_path: {template_path}")
+            logger.debug("Processed template_path: %s", template_path)
 
             # Generate parent hierarchy string
-            parent_hierarchy = ', '.join(filter(None, self.get_parent_hierarchy(parent_class)))
+            hierarchy = self.get_parent_hierarchy(parent_class)
+            parent_hierarchy = ', '.join(hierarchy)
             
+            constructor_params, property_builders = self._render_props_metadata(parsed_properties)
+
             # Log all format parameters
             format_params = {
                 'class_name': class_name,
                 'parent_class': parent_class,
                 'parent_hierarchy': parent_hierarchy,
                 'additional_imports': '\n'.join(additional_imports or []),
-                'template_file': template_path if template_path else "",
+                'template_file': template_path,
                 'template_children': self.generate_template_children(template_children or []),
                 'template_callbacks': self.generate_template_callbacks(template_callbacks or []),
                 'properties': self.generate_properties_code(parsed_properties),
                 'signals': self.generate_signals_code(parsed_signals),
-                'constructor_params': self.generate_constructor_params(parsed_properties),
-                'property_builders': self.generate_property_builders(parsed_properties),
+                'constructor_params': constructor_params,
+                'property_builders': property_builders,
                 'additional_methods': self.generate_additional_methods(parsed_properties, parsed_signals),
-                'parent_impls': self.generate_parent_impls(self.get_parent_hierarchy(parent_class), class_name)
+                'parent_impls': self.generate_parent_impls(hierarchy, class_name)
             }
             
-            logger.debug("Format parameters:")
-            for key, value in format_params.items():
-                logger.debug(f"{key}: {value}")
+            logger.debug("Format parameters: %r", format_params)
 
             # Generate the code
-            return self.imp_template.format(
-                class_name=class_name,
-                parent_class=parent_class,
-                parent_hierarchy=parent_hierarchy,
-                additional_imports='\n'.join(additional_imports or []),
-                template_file=template_path if template_path else "",
-                template_children=self.generate_template_children(template_children or []),
-                template_callbacks=self.generate_template_callbacks(template_callbacks or []),
-                properties=self.generate_properties_code(parsed_properties),
-                signals=self.generate_signals_code(parsed_signals),
-                constructor_params=self.generate_constructor_params(parsed_properties),
-                property_builders=self.generate_property_builders(parsed_properties),
-                additional_methods=self.generate_additional_methods(parsed_properties, parsed_signals),
-                parent_impls=self.generate_parent_impls(self.get_parent_hierarchy(parent_class), class_name)
-            )
+            return self.IMP_TEMPLATE.format(**format_params)
         except Exception as e:
             raise RuntimeError(f"Error generating code: {str(e)}")
 
 
-    def generate_constructor_params(self, properties: List[Property]) -> str:
-        return ', '.join(f'{p.name}: {p.rust_type}' for p in properties)
+    def _render_props_metadata(self, properties: List[Property]) -> Tuple[str, str]:
+        """Generate the new_with_params() parameter list and its property builder calls."""
+        constructor_params = []
+        property_builders = []
+        for p in properties:
+            constructor_params.append(f'{p.name}: {p.rust_type}')
+            property_builders.append(f'            .property("{p.name}", {p.name})')
+        return ', '.join(constructor_params), '\n'.join(property_builders)
 
-    def generate_property_builders(self, properties: List[Property]) -> str:
-        return '\n'.join(f'            .property("{p.name}", {p.name})' 
-                        for p in properties)
+    def _format_parent_impl(self, parent: str, class_name: str) -> str:
+        """Format the Impl block for a single parent class."""
+        # Extract the type name without module
+        type_name = parent.split('::')[-1]
+        
+        return f'''    impl {type_name}Impl for {class_name} {{
+        // Default implementations that forward to parent
+    }}'''
 
-    def generate_parent_impls(self, parent_hierarchy: List[str], class_name: str) -> str:
+    def generate_parent_impls(self, parent_hierarchy: Tuple[str, ...], class_name: str) -> str:
         """Generate Impl blocks for each parent class in the hierarchy.
         
         Args:
-            parent_hierarchy: List of parent classes in Rust format (e.g. ["gtk::Widget"])
+            parent_hierarchy: Parent classes in Rust format (e.g. ["gtk::Widget"])
             class_name: The name of the class being generated
         """
-        impls = []
-        for parent in parent_hierarchy:
-            if parent == "gtk::Widget":
-                continue  # Already handled by WidgetImpl
-            
-            # Extract the type name without module
-            type_name = parent.split('::')[-1]
-            
-            impl = f'''    impl {type_name}Impl for {class_name} {{
-        // Default implementations that forward to parent
-    }}'''
-            impls.append(impl)
-        
-        return '\n\n'.join(impls)
+        return '\n\n'.join(
+            self._format_parent_impl(parent, class_name)
+            for parent in parent_hierarchy
+            if parent != "gtk::Widget"  # Already handled by WidgetImpl
+        )
 
 def main():
     # Configure logging
@@ -638,7 +615,6 @@ def main():
         level=logging.DEBUG,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    logger = logging.getLogger(__name__)
     
     parser = argparse.ArgumentParser(description='Create a new GObject class in Rust')
     parser.add_argument('class_name', help='The class name in PascalCase')
@@ -658,14 +634,14 @@ def main():
     try:
         # Create generator instance
         generator = RustGObjectGenerator()
-        logger.debug(f"Generating code for class: {args.class_name}")
-        logger.debug(f"Parent class: {args.parent_class}")
-        logger.debug(f"Properties: {args.properties}")
-        logger.debug(f"Signals: {args.signals}")
-        logger.debug(f"Template file: {args.template}")
-        logger.debug(f"Template children: {args.template_children}")
-        logger.debug(f"Template callbacks: {args.template_callbacks}")
-        logger.debug(f"Additional imports: {args.imports}")
+        logger.debug("Generating code for class: %s", args.class_name)
+        logger.debug("Parent class: %s", args.parent_class)
+        logger.debug("Properties: %s", args.properties)
+        logger.debug("Signals: %s", args.signals)
+        logger.debug("Template file: %s", args.template)
+        logger.debug("Template children: %s", args.template_children)
+        logger.debug("Template callbacks: %s", args.template_callbacks)
+        logger.debug("Additional imports: %s", args.imports)
 
         # Generate the code
         rust_code = generator.generate_code(
@@ -680,11 +656,12 @@ def main():
         )
 
         # Ensure output directory exists
-        os.makedirs(args.path, exist_ok=True)
+        output_dir = Path(args.path)
+        output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Write to file
-        output_path = os.path.join(args.path, f"{args.class_name.lower()}.rs")
-        with open(output_path, 'w') as f:
+        # Write to file in one buffered write
+        output_path = output_dir / f"{args.class_name.lower()}.rs"
+        with open(output_path, 'w', buffering=1 << 20, encoding='utf-8') as f:
             f.write(rust_code)
             
         print(f"Successfully generated {output_path}")